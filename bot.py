@@ -26,6 +26,11 @@ class MyBot(commands.Bot):
         self.db = Database().get()
 
     async def setup_hook(self):
+        # Sweep anything a previous process (killed by systemd) left behind
+        # before we start creating new containers. Containers go first since
+        # they may still have the stale build dirs mounted.
+        await lib.purge_stale_containers()
+        lib.purge_stale_builds()
         await asyncio.gather(
             bot.add_cog(Commands(bot)),
             bot.add_cog(ErrorHandlerCog(bot))
@@ -1,78 +1,252 @@
 import asyncio
+import atexit
 import functools
+import hashlib
 import io
-import json
 import logging
+import math
 import os
-import pathlib
 import shutil
 import statistics as stats
+import subprocess
 import tempfile
+import time
 import traceback
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from datetime import datetime
 from sqlite3 import Cursor
 from typing import Optional, Tuple
 from zoneinfo import ZoneInfo
 
+import aiodocker
 import discord
-import docker
+import orjson
 from discord.ext import commands
 
 from config import settings
 from database import Database
 from error_handler import get_full_class_name
 
-doc = docker.from_env()
-
 logger = logging.getLogger(__name__)
 
+# One long-lived client for the whole process, so container ops share a
+# kept-alive connection to the daemon. Created lazily because aiodocker
+# binds to the running event loop.
+_aio_doc: Optional[aiodocker.Docker] = None
+
+
+def _docker() -> aiodocker.Docker:
+    """Return the shared aiodocker client, creating it on first use."""
+    global _aio_doc
+    if _aio_doc is None:
+        _aio_doc = aiodocker.Docker()
+    return _aio_doc
+
+
+# Label applied to every pooled container so stale ones from a previous
+# process can be found and removed at startup.
+_POOL_LABEL = "ferris-elf.pooled"
+
+
+class ContainerPool:
+    """
+    Long-lived benchmark containers, one per user.
+
+    Creating and destroying a container per build/run costs hundreds of ms of
+    Docker overhead each; instead we keep a `sleep infinity` container alive
+    per user and exec the build/bench commands inside it. A user's container
+    is replaced when their volume dir changes (each submission builds in a
+    fresh tmp dir).
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self):
+        # op_id -> (tmp_dir, container)
+        self._containers: dict[int, tuple[str, aiodocker.containers.DockerContainer]] = {}
+
+    async def get(self, op_id: int, tmp_dir: str) -> aiodocker.containers.DockerContainer:
+        """Return a running container for op_id with tmp_dir mounted at /app."""
+        entry = self._containers.get(op_id)
+        if entry is not None:
+            if entry[0] == tmp_dir:
+                return entry[1]
+            del self._containers[op_id]
+            await self._remove(entry[1])
+        container = await _docker().containers.run({
+            "Image": settings.docker.container_ref,
+            "Cmd": ["sleep", "infinity"],
+            "Labels": {_POOL_LABEL: "1"},
+            "HostConfig": {
+                "Binds": [f"{tmp_dir}:/app:rw"],
+                "Memory": 8 * 1024 ** 3,
+            },
+        })
+        self._containers[op_id] = (tmp_dir, container)
+        return container
+
+    async def discard(self, op_id: int, tmp_dir: str):
+        """
+        Remove op_id's container if it's bound to tmp_dir. Called before the
+        dir is deleted, so no container is left holding a gutted mount.
+        """
+        entry = self._containers.get(op_id)
+        if entry is not None and entry[0] == tmp_dir:
+            del self._containers[op_id]
+            await self._remove(entry[1])
+
+    def container_ids(self) -> list[str]:
+        return [c.id for (_, c) in self._containers.values()]
+
+    @staticmethod
+    async def _remove(container: aiodocker.containers.DockerContainer):
+        try:
+            await container.delete(force=True)
+        except aiodocker.DockerError:
+            logger.exception("Error removing pooled container")
+
+
+_container_pool = ContainerPool()
+
+
+def _shutdown_pool():
+    """Best-effort removal of pooled containers at interpreter exit."""
+    ids = _container_pool.container_ids()
+    if not ids:
+        return
+
+    async def _remove_all():
+        # The main loop (and the client bound to it) is gone by the time
+        # atexit runs, so use a throwaway client on a fresh loop.
+        docker = aiodocker.Docker()
+        try:
+            for container_id in ids:
+                try:
+                    await docker.containers.container(container_id).delete(force=True)
+                except aiodocker.DockerError:
+                    logger.exception("Error removing pooled container %s", container_id)
+        finally:
+            await docker.close()
+
+    try:
+        asyncio.run(_remove_all())
+    except Exception:
+        logger.exception("Error cleaning up container pool")
+
+
+atexit.register(_shutdown_pool)
+
+
+async def purge_stale_containers():
+    """
+    Remove pooled containers left over from a previous process. The atexit
+    hook only runs on clean exits — systemd stops the bot with SIGTERM, which
+    doesn't run atexit handlers — so every deploy would otherwise orphan the
+    per-user containers. They carry a label so we can find them at startup.
+    """
+    filters = orjson.dumps({"label": [_POOL_LABEL]}).decode()
+    containers = await _docker().containers.list(all=True, filters=filters)
+    for container in containers:
+        logger.info("Removing stale pooled container %s", container.id)
+        try:
+            await container.delete(force=True)
+        except aiodocker.DockerError:
+            logger.exception("Error removing stale pooled container %s", container.id)
+
+
+async def _exec(container: aiodocker.containers.DockerContainer, cmd: list[str], timeout: int,
+                env: Optional[dict[str, str]] = None,
+                keep_line=None) -> Tuple[Optional[int], list[str], list[str]]:
+    """
+    Run cmd inside a pooled container and return (exit_code, output_lines,
+    dropped_tail).
+
+    Output is split into lines as it streams from the exec rather than being
+    buffered whole; if keep_line is given, lines it rejects are dropped on
+    arrival, so memory stays bounded no matter how chatty the command is.
+    The last few rejected lines are kept in dropped_tail — compile errors,
+    panics, and timeout kills all fail the filter, and they're exactly what
+    we need to log when the command exits non-zero.
+    """
+    execute = await container.exec(cmd, stdout=True, stderr=True, environment=env, workdir="/app")
+    lines = []
+    dropped: deque[str] = deque(maxlen=64)
+    tail = ""
+    async with execute.start(timeout=timeout, detach=False) as stream:
+        while True:
+            msg = await stream.read_out()
+            if msg is None:
+                break
+            tail += msg.data.decode("utf-8", "replace")
+            *complete, tail = tail.split("\n")
+            for line in complete:
+                if keep_line is None or keep_line(line):
+                    lines.append(line)
+                else:
+                    dropped.append(line)
+    if tail:
+        if keep_line is None or keep_line(tail):
+            lines.append(tail)
+        else:
+            dropped.append(tail)
+    inspect = await execute.inspect()
+    while inspect["ExitCode"] is None:
+        await asyncio.sleep(0.05)
+        inspect = await execute.inspect()
+    return inspect["ExitCode"], lines, list(dropped)
+
+# Container ops are expensive; don't launch more of them at once than the host
+# has cores to run.
+_docker_sem = asyncio.Semaphore(os.cpu_count() or 4)
+
 
 async def benchmark(ctx: commands.Context, day: int, part: int, code: bytes, ):
     """Run the entire benchmark process, end-to-end."""
-    op_name, op_id = ctx.author.name, ctx.author.id
+    op_id = ctx.author.id
 
     try:
         db = Database().get()
         cur = db.cursor()
         results = []
-        with tempfile.TemporaryDirectory(suffix=f"-ferris-elf-{op_id}") as tmpdir:
-            populate_tmp_dir(tmpdir, code)
-            if not await build_code(op_name, op_id, tmpdir):
-                # This reply is not good UX, but it's better than silence.
-                await ctx.reply("Build failed.")
-                return
-            answers_map = load_answers(cur, day, part)
-            for in_file in get_input_files(day):
-                logger.info("Processing file: %s", in_file)
-                load_input(tmpdir, day, in_file)
-                result_lst = await run_code(op_name, op_id, tmpdir, in_file)
-                result = process_run_result(in_file, answers_map, result_lst)
-                results.append(result)
-
-            if len(results) > 0:
-                save_results(cur, op_id, day, part, code, results)
-                db.commit()
+        tmpdir = await _get_build_dir(op_id, code)
+        if tmpdir is None:
+            # This reply is not good UX, but it's better than silence.
+            await ctx.reply("Build failed.")
+            return
+        answers_map = load_answers(day, part)
+        # Measurement runs stay sequential on purpose: they share the pooled
+        # container's target/ dir (cargo's lock would serialize them anyway,
+        # with each queued run burning its own timeout), and concurrent
+        # benches contending for cores would jitter the very numbers we rank.
+        for in_file in get_input_files(day):
+            logger.info("Processing file: %s", in_file)
+            load_input(tmpdir, day, in_file)
+            result_lst = await run_code(op_id, tmpdir, in_file)
+            result = process_run_result(in_file, answers_map, result_lst)
+            results.append(result)
+
+        if len(results) > 0:
+            save_results(cur, op_id, day, part, code, results)
+            db.commit()
 
         verified_results = [r for r in results if r.verified]
-        if len(verified_results) > 0:
-            median = stats.mean([r.median for r in verified_results])
-            average = stats.mean([r.average for r in verified_results])
-            await ctx.reply(
-                embed=discord.Embed(
-                    title="Benchmark complete (Verified)",
-                    description=f"Median: **{ns(median)}**\nAverage: **{ns(average)}**",
-                )
-            )
-        else:
-            median = stats.mean([r.median for r in results])
-            average = stats.mean([r.average for r in results])
-            await ctx.reply(
-                embed=discord.Embed(
-                    title="Benchmark complete (Unverified)",
-                    description=f"Median: **{ns(median)}**\nAverage: **{ns(average)}**",
-                )
+        scored = verified_results if verified_results else results
+        # Criterion occasionally never reports, leaving median/average as
+        # None; those rows used to crash stats.mean.
+        timed = [r for r in scored if r.median is not None and r.average is not None]
+        if not timed:
+            await ctx.reply("Benchmark complete, but no timings were produced.")
+            return
+        median = stats.fmean(r.median for r in timed)
+        average = stats.fmean(r.average for r in timed)
+        title = "Benchmark complete (Verified)" if verified_results else "Benchmark complete (Unverified)"
+        await ctx.reply(
+            embed=discord.Embed(
+                title=title,
+                description=f"Median: **{ns(median)}**\nAverage: **{ns(average)}**",
             )
+        )
 
     except Exception as e:
         logger.exception(f"Unhandled exception while benchmarking day {day}, part {part}.")
@@ -86,17 +260,37 @@ async def benchmark(ctx: commands.Context, day: int, part: int, code: bytes, ):
         #     await ctx.reply(errtxt, file=discord.File(buf, filename="traceback.txt"))
 
 
+@functools.lru_cache(maxsize=1)
+def _runner_template() -> str:
+    """
+    Materialize a filtered copy of the runner sources once per process.
+    populate_tmp_dir clones this template instead of re-applying the ignore
+    patterns to the source tree for every submission.
+    """
+    template_dir = tempfile.mkdtemp(suffix="-ferris-elf-runner")
+    atexit.register(shutil.rmtree, template_dir, ignore_errors=True)
+    script_dir = os.path.dirname(__file__)
+    runner_src_dir = os.path.join(script_dir, "runner")
+    ignores = shutil.ignore_patterns("*target*", "Dockerfile", "**/.gitkeep")
+    shutil.copytree(runner_src_dir, template_dir, dirs_exist_ok=True, ignore=ignores)
+    return template_dir
+
+
 def populate_tmp_dir(tmp_dir: str, solution_code: bytes):
     """
     Set up tmp_dir for building. This copies in the runner and submitted code,
     but not the AOC inputs. We'll read those later.
     """
     logger.info("Building temp dir to use as volume")
-    # Step 1: Copy all the rust files
-    script_dir = os.path.dirname(__file__)
-    runner_src_dir = os.path.join(script_dir, "runner")
-    ignores = shutil.ignore_patterns("*target*", "Dockerfile", "**/.gitkeep")
-    shutil.copytree(runner_src_dir, tmp_dir, dirs_exist_ok=True, ignore=ignores)
+    # Step 1: Clone the runner template. --reflink=auto is copy-on-write
+    # (effectively free) on filesystems that support it, a plain copy
+    # elsewhere. We deliberately don't hardlink: the container has write
+    # access to this tree and must not be able to touch the template.
+    template = _runner_template()
+    try:
+        subprocess.run(["cp", "-a", "--reflink=auto", template + "/.", tmp_dir], check=True)
+    except (OSError, subprocess.CalledProcessError):
+        shutil.copytree(template, tmp_dir, dirs_exist_ok=True)
 
     # Step 2: Write code.
     code_path = os.path.join(tmp_dir, "src", "code.rs")
@@ -104,35 +298,109 @@ def populate_tmp_dir(tmp_dir: str, solution_code: bytes):
         code_file.write(solution_code)
 
 
-async def build_code(author_name: str, author_id: int, tmp_dir: str) -> bool:
+# (op_id, code hash) -> dir with a completed build, most recently used last.
+# Users iterating on inputs often resubmit byte-identical code; reusing the
+# built tree skips the cargo build entirely, which dominates benchmark
+# latency. Dirs persist between submissions and are removed on eviction;
+# each holds a full cargo target/ dir, so the cap (docker.build_cache_entries)
+# is deliberately small.
+_BUILD_CACHE: OrderedDict[tuple[int, str], str] = OrderedDict()
+
+
+async def _get_build_dir(author_id: int, code: bytes) -> Optional[str]:
     """
-    Designed to be used with a basic rust container. Run the container
-    with `cargo build` to build the code. Code is mounted in as a volume,
-    so that binaries are saved between build/run.
+    Return a dir containing a built copy of `code` for this user, reusing the
+    cached build when the submitted code is byte-identical. Returns None if
+    the build failed.
+    """
+    code_hash = hashlib.blake2b(code, digest_size=16).hexdigest()
+    key = (author_id, code_hash)
+    tmp_dir = _BUILD_CACHE.get(key)
+    if tmp_dir is not None:
+        logger.info("Reusing cached build for %s (%s)", author_id, code_hash)
+        _BUILD_CACHE.move_to_end(key)
+        return tmp_dir
+
+    build_root = os.path.abspath(settings.docker.build_cache_dir)
+    os.makedirs(build_root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(suffix=f"-ferris-elf-{author_id}", dir=build_root)
+    populate_tmp_dir(tmp_dir, code)
+    if not await build_code(author_id, tmp_dir):
+        await _container_pool.discard(author_id, tmp_dir)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+    _BUILD_CACHE[key] = tmp_dir
+    while len(_BUILD_CACHE) > settings.docker.build_cache_entries:
+        (old_id, _), old_dir = _BUILD_CACHE.popitem(last=False)
+        # The evicted user's idle container may still have this dir bind-
+        # mounted; drop it before gutting the mount.
+        await _container_pool.discard(old_id, old_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return tmp_dir
+
+
+def _cleanup_build_cache():
+    for tmp_dir in _BUILD_CACHE.values():
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+atexit.register(_cleanup_build_cache)
+
+
+def purge_stale_builds():
+    """
+    Remove leftover build dirs from a previous process. _BUILD_CACHE is
+    in-memory only, so anything on disk at startup is orphaned — uncapped by
+    build_cache_entries and 1-2 GB apiece — and with systemd restarting the
+    bot routinely, builds/ would otherwise grow without limit.
+    """
+    build_root = os.path.abspath(settings.docker.build_cache_dir)
+    if not os.path.isdir(build_root):
+        return
+    for entry in os.scandir(build_root):
+        logger.info("Removing stale build dir %s", entry.path)
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+async def build_code(author_id: int, tmp_dir: str) -> bool:
+    """
+    Designed to be used with a basic rust container. Exec `cargo build`
+    in the user's pooled container to build the code. Code is mounted in
+    as a volume, so that binaries are saved between build/run.
     """
     logger.info("Running container to build code for %s", author_id)
     try:
-        loop = asyncio.get_event_loop()
-        out = await loop.run_in_executor(None, functools.partial(
-            doc.containers.run,
-            settings.docker.container_ref,
-            "timeout --kill-after=5s 30s cargo build",
-            remove=True,
-            stdout=True,
-            mem_limit="8g",
-            # network_mode="none", # Want no-network, but it's downloading crates. :(
-            volumes={tmp_dir: {'bind': '/app', 'mode': 'rw'}}
-        ))
-        out = out.decode("utf-8")
-        logger.debug("Build container output: %s", out)
+        async with _docker_sem:
+            container = await _container_pool.get(author_id, tmp_dir)
+            exit_code, out_lines, _ = await _exec(
+                container, ["timeout", "--kill-after=5s", "30s", "cargo", "build"], timeout=35)
+        if exit_code != 0:
+            logger.error("Build failed for %s: %s", author_id, "\n".join(out_lines))
+            return False
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Build container output: %s", "\n".join(out_lines))
         return True
-    except docker.errors.ContainerError:
+    except (aiodocker.DockerError, asyncio.TimeoutError):
         logger.exception("Error in docker while building code")
         return False
 
 
-def load_answers(cursor: Cursor, day: int, part: int):
-    """Load the expected answers for each input file."""
+def load_answers(day: int, part: int):
+    """
+    Load the expected answers for each input file. The solutions table is
+    only ever written out-of-band (straight into the SQLite file), so the
+    cache is keyed on PRAGMA data_version, which bumps whenever another
+    connection commits — answers inserted mid-season get picked up without
+    a restart.
+    """
+    db = Database().get()
+    (data_version,) = db.execute("PRAGMA data_version").fetchone()
+    return _load_answers_cached(day, part, data_version)
+
+
+@functools.lru_cache(maxsize=128)
+def _load_answers_cached(day: int, part: int, data_version: int):
+    cursor = Database().get().cursor()
     rows = cursor.execute(
         "SELECT key, answer2 FROM solutions WHERE day = ? AND part = ?",
         (day, part),
@@ -151,70 +419,78 @@ def get_input_files(day: int) -> list[str]:
     List all the input files that exist for the current day.
     """
     day_path = get_input_dir_for_day(day)
+    # Keyed on the dir's mtime so newly fetched inputs still show up.
+    return _scan_input_files(day_path, os.path.getmtime(day_path))
+
+
+@functools.lru_cache(maxsize=64)
+def _scan_input_files(day_path: str, mtime: float) -> list[str]:
     return [f for f in os.listdir(day_path) if os.path.isfile(os.path.join(day_path, f))]
 
 
 def load_input(tmp_dir: str, day: int, file_name: str):
     """
-    Populate tmp_dir with the input files for the requested year/day.
+    Place one of the day's input files into the container's inputs dir.
+    Each input gets its own path so concurrent runs don't race on a shared
+    target; run_code points the runner at the right one per run.
     """
     day_path = get_input_dir_for_day(day)
-    container_inputs_path = os.path.join(tmp_dir, "inputs")
-
-    # Step 1: Clear out anything there
-
-    for path in pathlib.Path(container_inputs_path).glob("**/*"):
-        if path.is_file():
-            path.unlink()
-        elif path.is_dir():
-            shutil.rmtree(path)
-
-    for path in pathlib.Path(container_inputs_path).glob("**/.*"):
-        if path.is_file():
-            path.unlink()
-        elif path.is_dir():
-            shutil.rmtree(path)
-
-    # Step 2: Copy the appropriate file.
-    shutil.copy(os.path.join(day_path, file_name), container_inputs_path)
+    target = os.path.join(tmp_dir, "inputs", file_name)
 
-
-async def run_code(author_name: str, author_id: int, tmp_dir: str, in_file: str) -> Optional[list[str]]:
+    try:
+        os.unlink(target)
+    except FileNotFoundError:
+        pass
+    # A symlink would dangle inside the container (it would point at a host
+    # path outside the bind mount), and a hardlink would share the inode with
+    # the canonical input — the volume is mounted rw, so submitted code could
+    # tamper with the file every other user is verified against. Copy the
+    # bytes; they're the security boundary here.
+    shutil.copy(os.path.join(day_path, file_name), target)
+
+
+async def run_code(author_id: int, tmp_dir: str, in_file: str) -> Optional[list[str]]:
     """
     Designed to be used with a basic rust container. Given the code already
-    built in tmp_dir as a volume, run the benchmark itself.
+    built in tmp_dir as a volume, exec the benchmark itself in the user's
+    pooled container.
     """
     in_file_name = os.path.join("/app", "inputs", in_file)
     logger.info("Running container to run code for %s", author_id)
     try:
-        loop = asyncio.get_event_loop()
-        out = await loop.run_in_executor(None, functools.partial(
-            doc.containers.run,
-            settings.docker.container_ref,
-            "timeout --kill-after=5s 60s cargo criterion --message-format=json",
-            environment={
-                "FERRIS_ELF_INPUT_FILE_NAME": in_file_name,
-            },
-            remove=True,
-            stdout=True,
-            stderr=True,
-            mem_limit="8g",
-            # network_mode="none", # Downloading crates.
-            volumes={tmp_dir: {'bind': '/app', 'mode': 'rw'}}
-        ))
-        out: str = out.decode("utf-8")
-        logger.debug("Run container output (type: %s):\n%s", type(out), out)
+        async with _docker_sem:
+            container = await _container_pool.get(author_id, tmp_dir)
+            # At DEBUG we keep everything for the dump below; otherwise only
+            # the JSON lines survive, so criterion's progress chatter never
+            # accumulates in memory.
+            keep_all = logger.isEnabledFor(logging.DEBUG)
+            exit_code, out_lines, dropped = await _exec(
+                container,
+                ["timeout", "--kill-after=5s", "60s",
+                 "cargo", "criterion", "--message-format=json"],
+                timeout=65,
+                env={"FERRIS_ELF_INPUT_FILE_NAME": in_file_name},
+                keep_line=None if keep_all else lambda l: l.startswith("{"),
+            )
+        if exit_code != 0:
+            # The filtered-out tail is where the actual diagnostics live.
+            logger.error("Run failed for %s: %s", author_id, "\n".join([*dropped, *out_lines]))
+            return None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Run container output:\n%s", "\n".join(out_lines))
         results = []
 
-        for l in out.splitlines():
+        # The daemon already hands us the output line by line; parse each
+        # JSON line directly instead of joining and re-splitting the lot.
+        for l in out_lines:
             if len(l) == 0 or l[0] != '{':
                 continue
-            l_data = json.loads(l)
+            l_data = orjson.loads(l)
             results.append(l_data)
 
         logger.debug("Results from container run for user %s, file %s: %s", author_id, in_file, results)
         return results
-    except docker.errors.ContainerError:
+    except (aiodocker.DockerError, asyncio.TimeoutError):
         logger.exception("Error in docker while running code")
         return None
 
@@ -232,32 +508,50 @@ class RunResult:
     low_bound: Optional[float]
 
 
+def _handle_answer(blob, result: RunResult, answers_map, in_file):
+    answer = blob["answer"]
+    result.answer = answer
+    result.verified = answers_map.get(in_file, None) == answer
+
+
+def _handle_bench(blob, result: RunResult, answers_map, in_file):
+    result.typical = blob["typical"]["estimate"]
+    result.average = blob["mean"]["estimate"]
+    result.median = blob["median"]["estimate"]
+    result.high_bound = blob["typical"]["upper_bound"]
+    result.low_bound = blob["typical"]["lower_bound"]
+
+
+# Dispatch on the blob's "reason"; each handler mutates the RunResult in
+# place. Blobs with no (or an unknown) reason are skipped.
+_RESULT_HANDLERS = {
+    "ferris-answer": _handle_answer,
+    "benchmark-complete": _handle_bench,
+}
+
+
 def process_run_result(in_file, answers_map, result_lst) -> RunResult:
     """Given JSON blobs extracted from a container's stdout, get the core stats out."""
-    # `result` should be a dataclass, not a dict. Another time.
     result = RunResult(answer="", verified=False, typical=None, average=None, median=None, high_bound=None,
                        low_bound=None)
     for blob in result_lst:
-        reason = blob.get("reason", None)
-        if reason is None:
-            continue
-        elif reason == "ferris-answer":
-            answer = blob["answer"]
-            result.answer = answer
-            if answers_map.get(in_file, None) == answer:
-                result.verified = True
-            else:
-                result.verified = False
-        elif reason == "benchmark-complete":
-            result.typical = blob["typical"]["estimate"]
-            result.average = blob["mean"]["estimate"]
-            result.median = blob["median"]["estimate"]
-            result.high_bound = blob["typical"]["upper_bound"]
-            result.low_bound = blob["typical"]["lower_bound"]
+        handler = _RESULT_HANDLERS.get(blob.get("reason"))
+        if handler is not None:
+            handler(blob, result, answers_map, in_file)
     logger.info("Computed run result: %s", result)
     return result
 
 
+def _maybe_int(answer: int | str) -> Optional[int]:
+    """Parse an answer to an int for the legacy `answer` column, else None."""
+    if isinstance(answer, int):
+        return answer
+    try:
+        return int(answer)
+    except ValueError:
+        return None
+
+
 def save_results(cur: Cursor, author_id: int, day: int, part: int, code: bytes, results):
     """
     Save the benchmark run results to the DB.
@@ -265,23 +559,32 @@ def save_results(cur: Cursor, author_id: int, day: int, part: int, code: bytes,
 
     str_code = code.decode()
     db_results = [(str(author_id), str_code, day, part, r.median,
-                   int(r.answer) if isinstance(r.answer, int) or r.answer.isdigit() else None, r.answer) for r in
-                  results]
+                   _maybe_int(r.answer), r.answer) for r in results]
 
     query = "INSERT INTO runs(user, code, day, part, time, answer, answer2) VALUES (?, ?, ?, ?, ?, ?, ?)"
 
-    cur.executemany(query, db_results)
+    # One transaction for the whole batch: N input files become one fsync
+    # instead of one per row.
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        cur.executemany(query, db_results)
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+    cur.execute("COMMIT")
+
+
+_NS_UNITS = ("ns", "µs", "ms", "s")
 
 
 def ns(v) -> str:
     """Format number of nanoseconds for display."""
-    if v > 1e9:
-        return f"{v / 1e9:.2f}s"
-    if v > 1e6:
-        return f"{v / 1e6:.2f}ms"
-    if v > 1e3:
-        return f"{v / 1e3:.2f}µs"
-    return f"{v:.0f}ns"
+    # One log10 + table lookup instead of a comparison ladder; the
+    # leaderboard formats thousands of these per request.
+    i = min(int(math.log10(v)) // 3, 3) if v >= 1 else 0
+    if i == 0:
+        return f"{v:.0f}ns"
+    return f"{v / 1000 ** i:.2f}{_NS_UNITS[i]}"
 
 
 def get_best_times(day) -> Tuple[list[Tuple[int, str]], list[Tuple[int, str]]]:
@@ -290,21 +593,15 @@ def get_best_times(day) -> Tuple[list[Tuple[int, str]], list[Tuple[int, str]]]:
     tuple of lists, first for Part 1, then for Part 2. Each list is of (user_id, formatted_time).
     """
     db = Database().get()
-    query = """SELECT user, MIN(time) FROM runs WHERE day = ? AND part = ?
-           GROUP BY user ORDER BY time"""
+    query = """SELECT part, user, MIN(time) FROM runs
+           WHERE day = ? AND part IN (1, 2) AND user IS NOT NULL AND time IS NOT NULL
+           GROUP BY part, user ORDER BY part, time"""
 
     times1 = []
-    for user_id, time in db.cursor().execute(query, (day, 1)):
-        if user_id is None or time is None:
-            continue
-        user_id = int(user_id)
-        times1.append((user_id, ns(time)))
     times2 = []
-    for user_id, time in db.cursor().execute(query, (day, 2)):
-        if user_id is None or time is None:
-            continue
-        user_id = int(user_id)
-        times2.append((user_id, ns(time)))
+    for part, user_id, time in db.cursor().execute(query, (day,)):
+        times = times1 if part == 1 else times2
+        times.append((int(user_id), ns(time)))
     return (times1, times2)
 
 
@@ -314,13 +611,21 @@ def get_input_dir_for_day(day: int) -> str:
     return os.path.abspath(day_path)
 
 
+_NY_TZ = ZoneInfo("America/New_York")
+
+
+@functools.lru_cache(maxsize=2)
+def _aoc_now(bucket: int) -> datetime:
+    """Current AOC time, cached per one-second bucket so hot paths that ask
+    for today()/year() repeatedly share one tz-aware datetime."""
+    return datetime.now(tz=_NY_TZ)
+
+
 def year() -> int:
     """Return the current year, as AOC code should understand it."""
-    stamp = datetime.now(tz=ZoneInfo("America/New_York"))
-    return stamp.year
+    return _aoc_now(int(time.time())).year
 
 
 def today() -> int:
     """Return the current day, as AOC code should understand it."""
-    stamp = datetime.now(tz=ZoneInfo("America/New_York"))
-    return min(stamp.day, 25)
+    return min(_aoc_now(int(time.time())).day, 25)